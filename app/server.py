@@ -1,262 +1,695 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+import asyncio
 import joblib
-import whois
-import requests
+import numpy as np
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+import httpx
 from bs4 import BeautifulSoup
+from cachetools import TTLCache
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 import urllib.parse
 from datetime import datetime
+import dns.asyncresolver
 import dns.resolver
+import ipaddress
 import re
 import sys
 import os
 
+# Built once at import so /etc/resolv.conf is read up front rather than on
+# the first request.
+resolver = dns.asyncresolver.Resolver()
+
+# Upper bound on the WHOIS and page lookups within a request. A lookup that
+# runs over falls back to its features' suspicious default (-1) instead of
+# stalling the response. DNS keeps the resolver's own deadline, since a failed
+# DNS lookup flags the URL as phishing outright.
+LOOKUP_TIMEOUT = 2.0
+# A shared WHOIS query may outlive the request that started it so the result
+# still reaches the cache, but is abandoned after this long.
+WHOIS_QUERY_TIMEOUT = 10.0
+
+# Reused input row for the model. It is filled and consumed without an
+# intervening await, so concurrent requests on the event loop cannot interleave.
+_FEAT_BUF = np.empty((1, 30), dtype=np.int8)
+
+# Per-domain lookup caches. WHOIS data changes rarely, DNS and page content
+# are kept only briefly.
+_whois_cache = TTLCache(maxsize=10000, ttl=3600)
+_dns_cache = TTLCache(maxsize=4096, ttl=60)
+# Page-based features per URL; the parsed DOM itself is not kept
+_page_feature_cache = TTLCache(maxsize=4096, ttl=30)
+# Features that depend only on the domain, kept as long as its DNS result
+_domain_feature_cache = TTLCache(maxsize=4096, ttl=60)
+
 # --- Helper Functions ---
 
 def get_domain(url):
+    # Not memoized: request URLs are cached through parse_url, and the page
+    # links this also sees are mostly unique.
+    # Fast path for the plain http(s) URLs the endpoints produce; anything
+    # unusual goes through urlparse so the result is always its netloc.
+    if url.startswith(('http://', 'https://')) and not any(c in url for c in '[\t\r\n'):
+        start = url.index('://') + 3
+        end = len(url)
+        for sep in '/?#':
+            i = url.find(sep, start)
+            if i != -1 and i < end:
+                end = i
+        return url[start:end]
     try:
         return urllib.parse.urlparse(url).netloc
     except:
         return None
 
-def get_soup(url):
+async def get_soup(url):
     """Fetches the URL and returns a BeautifulSoup object, or None on failure."""
     try:
-        response = requests.get(url, timeout=5)
+        response = await app.state.http.get(url, timeout=LOOKUP_TIMEOUT, follow_redirects=True)
         response.raise_for_status()  # Raise an exception for bad status codes
-        return BeautifulSoup(response.text, 'html.parser')
-    except requests.exceptions.RequestException:
+    except httpx.HTTPError:
+        return None
+    # Parsing is CPU-bound, so the loop's default CPU-sized executor is enough
+    return await asyncio.get_running_loop().run_in_executor(
+        None, BeautifulSoup, response.text, 'lxml'
+    )
+
+# --- WHOIS Client ---
+
+# WHOIS servers for common TLDs (read-only); others are discovered through IANA
+_TLD_WHOIS = MappingProxyType({
+    "com": "whois.verisign-grs.com", "net": "whois.verisign-grs.com",
+    "org": "whois.pir.org", "info": "whois.nic.info", "io": "whois.nic.io",
+    "co": "whois.nic.co", "me": "whois.nic.me", "xyz": "whois.nic.xyz",
+    "uk": "whois.nic.uk", "de": "whois.denic.de", "fr": "whois.nic.fr",
+    "nl": "whois.domain-registry.nl", "eu": "whois.eu", "au": "whois.auda.org.au",
+    "ca": "whois.cira.ca", "in": "whois.registry.in", "ru": "whois.tcinet.ru",
+})
+
+# Servers for other TLDs as reported by IANA. Bounded since the TLD comes from
+# caller input.
+_discovered_whois = TTLCache(maxsize=1024, ttl=86400)
+
+# Second-level labels under which domains are registered one level deeper
+_SECOND_LEVEL = frozenset({"co", "com", "net", "org", "gov", "ac", "edu"})
+
+_CREATION_RE = re.compile(
+    r'^\s*(?:creation date|created(?: on)?|registered(?: on)?|registration time'
+    r'|domain registration date)\s*:\s*(.+)$', re.I | re.M
+)
+_EXPIRATION_RE = re.compile(
+    r'^\s*(?:registry expiry date|registrar registration expiration date|expiration date'
+    r'|expiry date|expires(?: on)?|paid-till|domain expiration date)\s*:\s*(.+)$', re.I | re.M
+)
+# A registered domain's record names it; "not registered" replies do not
+_DOMAIN_NAME_RE = re.compile(r'^\s*domain(?: name)?\s*:', re.I | re.M)
+_NOT_FOUND_RE = re.compile(
+    r'^\s*(?:no match|not found|no data found|no entries found|no object found'
+    r'|status:\s*(?:free|available))', re.I | re.M
+)
+_REFER_RE = re.compile(r'^(?:refer|whois):\s*(\S+)', re.I | re.M)
+_DATE_FORMATS = ('%Y-%m-%d', '%d-%b-%Y', '%d.%m.%Y', '%Y.%m.%d', '%Y/%m/%d', '%d/%m/%Y')
+
+class WhoisRecord:
+    """Raw WHOIS response with the dates the features need."""
+
+    def __init__(self, text):
+        self.text = text
+        self.creation_date = _parse_whois_date(_CREATION_RE, text)
+        self.expiration_date = _parse_whois_date(_EXPIRATION_RE, text)
+
+    def __str__(self):
+        return self.text
+
+def _parse_whois_date(pattern, text):
+    match = pattern.search(text)
+    if not match:
+        return None
+    value = match.group(1).strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        # Features compare against the naive local clock
+        return parsed.replace(tzinfo=None)
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value.split()[0], fmt)
+        except ValueError:
+            continue
+    return None
+
+def registered_domain(domain):
+    """
+    Strips userinfo, port and subdomains, e.g. 'www.example.co.uk:443' -> 'example.co.uk'.
+    Raises LookupError for hosts that have no registered domain, such as IP
+    literals or dotless names, so no WHOIS query is made for them.
+    """
+    host = domain.rsplit('@', 1)[-1].lower()
+    if host.startswith('['):
+        raise LookupError(f"No registered domain for {domain}")
+    host = host.split(':', 1)[0].rstrip('.')
+    if '.' not in host:
+        raise LookupError(f"No registered domain for {domain}")
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        pass
+    else:
+        raise LookupError(f"No registered domain for {domain}")
+    labels = host.split('.')
+    keep = 3 if len(labels) > 2 and labels[-2] in _SECOND_LEVEL else 2
+    return '.'.join(labels[-keep:])
+
+async def _whois_request(server, query):
+    reader, writer = await asyncio.open_connection(server, 43)
+    try:
+        writer.write((query + '\r\n').encode())
+        await writer.drain()
+        data = await reader.read()
+    finally:
+        writer.close()
+    return data.decode('utf-8', errors='replace')
+
+async def _whois_server(tld):
+    if tld in _TLD_WHOIS:
+        return _TLD_WHOIS[tld]
+    if tld not in _discovered_whois:
+        match = _REFER_RE.search(await _whois_request('whois.iana.org', tld))
+        # TLDs without a WHOIS server are remembered too, so IANA is asked once
+        _discovered_whois[tld] = match.group(1) if match else None
+    server = _discovered_whois[tld]
+    if server is None:
+        raise LookupError(f"No WHOIS server known for .{tld}")
+    return server
+
+async def whois_query(domain):
+    """Queries the TLD's WHOIS server directly over port 43 and returns a WhoisRecord."""
+    domain = registered_domain(domain)
+    if domain in _whois_cache:
+        return _whois_cache[domain]
+    server = await _whois_server(domain.rsplit('.', 1)[-1])
+    text = await _whois_request(server, domain)
+    if _NOT_FOUND_RE.search(text) or not _DOMAIN_NAME_RE.search(text):
+        raise LookupError(f"No WHOIS record for {domain}")
+    record = WhoisRecord(text)
+    _whois_cache[domain] = record
+    return record
+
+async def whois_lookup(domain):
+    """Runs a WHOIS query for a domain, or returns None on failure."""
+    try:
+        return await asyncio.wait_for(whois_query(domain), WHOIS_QUERY_TIMEOUT)
+    except Exception:
         return None
 
+# In-flight WHOIS lookups, so concurrent requests for one domain share a query
+_whois_pending = {}
+
+async def _whois_once(domain):
+    # Keyed like _whois_cache, so www.example.com and example.com share a query
+    key = registered_domain(domain)
+    future = _whois_pending.get(key)
+    if future is None:
+        future = asyncio.ensure_future(whois_lookup(key))
+        _whois_pending[key] = future
+        future.add_done_callback(lambda _: _whois_pending.pop(key, None))
+    # Shielded so one cancelled request does not cancel the shared lookup
+    return await asyncio.shield(future)
+
 # --- Feature Extraction Functions ---
 
-def having_ip_address(url):
+_SHORTENERS = frozenset({
+    "bit.ly", "goo.gl", "t.co", "tinyurl.com", "is.gd", "cli.gs",
+    "tr.im", "ow.ly", "tiny.cc"
+})
+
+# Tokens behind the '@', '//' and '-' string features, found in a single scan
+_URL_TOKEN_RE = re.compile(r'[@-]|//')
+_C0_CONTROL_OR_SPACE = ''.join(map(chr, range(33)))
+
+@dataclass(frozen=True, slots=True)
+class ParsedURL:
+    """URL components shared by all feature functions, computed once per URL."""
+    raw: str
+    domain: str
+    length: int
+    dots: int
+    https: bool
+    has_at: bool
+    path_double_slash: bool
+    host_dash: bool
+
+@lru_cache(maxsize=8192)
+def parse_url(url):
+    """Splits the URL once and scans it once for the string-based features."""
+    domain = get_domain(url) or ''
+    # Clean the text the same way urlsplit does before locating its parts:
+    # leading control characters and spaces are dropped, as are all tabs
+    # and newlines
+    text = url.lstrip(_C0_CONTROL_OR_SPACE)
+    for c in '\t\r\n':
+        text = text.replace(c, '')
+    # Then locate the host the same way urlparse does: after an optional
+    # scheme and a '//' delimiter
+    host_start = 0
+    scheme, sep, _ = text.partition(':')
+    if sep and scheme[:1].isascii() and scheme[:1].isalpha() \
+            and all(c in urllib.parse.scheme_chars for c in scheme):
+        host_start = len(scheme) + 1
+    if text.startswith('//', host_start):
+        host_start += 2
+    host_end = host_start + len(domain)
+    # The path runs from the end of the host up to any query or fragment
+    path_end = len(text)
+    for sep in '?#':
+        i = text.find(sep, host_end)
+        if i != -1 and i < path_end:
+            path_end = i
+
+    has_at = path_double_slash = host_dash = False
+    for match in _URL_TOKEN_RE.finditer(text):
+        token, pos = match.group(), match.start()
+        if token == '@':
+            has_at = True
+        elif token == '-':
+            host_dash = host_dash or host_start <= pos < host_end
+        elif host_end <= pos and match.end() <= path_end:
+            path_double_slash = True
+
+    return ParsedURL(
+        raw=url, domain=domain, length=len(url), dots=domain.count('.'),
+        https=url.startswith("https"), has_at=has_at,
+        path_double_slash=path_double_slash, host_dash=host_dash
+    )
+
+def having_ip_address(p):
     try:
-        domain = get_domain(url)
-        if re.match(r"^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$", domain):
-            return -1
-        return 1
-    except:
+        ipaddress.ip_address(p.domain)
         return -1
+    except ValueError:
+        return 1
 
-def url_length(url):
-    if len(url) < 54: return 1
-    if 54 <= len(url) <= 75: return 0
+def url_length(p):
+    if p.length < 54: return 1
+    if 54 <= p.length <= 75: return 0
     return -1
 
-def shortening_service(url):
-    domain = get_domain(url)
-    shortening_services = [
-        "bit.ly", "goo.gl", "t.co", "tinyurl.com", "is.gd", "cli.gs", 
-        "tr.im", "ow.ly", "tiny.cc"
-    ]
-    if domain in shortening_services: return -1
-    return 1
+def shortening_service(p):
+    return -1 if p.domain.lower() in _SHORTENERS else 1
 
-def having_at_symbol(url):
-    return -1 if "@" in url else 1
+def having_at_symbol(p):
+    return -1 if p.has_at else 1
 
-def double_slash_redirecting(url):
+def double_slash_redirecting(p):
     # Checks for "//" in the path part of the URL
-    path = urllib.parse.urlparse(url).path
-    return -1 if path.startswith('//') or "//" in path[1:] else 1
+    return -1 if p.path_double_slash else 1
 
-def prefix_suffix(url):
-    return -1 if "-" in get_domain(url) else 1
+def prefix_suffix(p):
+    return -1 if p.host_dash else 1
 
-def having_sub_domain(url):
-    dots = get_domain(url).count('.')
+def having_sub_domain(p):
     # Standard domains like google.com have 1 dot.
-    if dots == 2: return 0   # e.g., mail.google.com
-    if dots > 2: return -1    # e.g., my.app.mail.google.com
+    if p.dots == 2: return 0   # e.g., mail.google.com
+    if p.dots > 2: return -1    # e.g., my.app.mail.google.com
     return 1                 # e.g., google.com
 
-def ssl_final_state(url):
+def ssl_final_state(p):
     # This is a simplified check. A full check is more complex.
-    return 1 if url.startswith("https") else -1
+    return 1 if p.https else -1
 
-def domain_registration_length(url):
+def domain_registration_length(w):
     try:
-        domain = get_domain(url)
-        w = whois.whois(domain)
         if w.expiration_date and w.creation_date:
-            exp = w.expiration_date[0] if isinstance(w.expiration_date, list) else w.expiration_date
-            cre = w.creation_date[0] if isinstance(w.creation_date, list) else w.creation_date
-            if (exp - cre).days / 365 <= 1:
+            if (w.expiration_date - w.creation_date).days / 365 <= 1:
                 return -1
         return 1
     except:
         return -1
 
-def age_of_domain(url):
+def age_of_domain(w):
     try:
-        domain = get_domain(url)
-        w = whois.whois(domain)
         if w.creation_date:
-            cre = w.creation_date[0] if isinstance(w.creation_date, list) else w.creation_date
-            if (datetime.now() - cre).days < 180:
+            if (datetime.now() - w.creation_date).days < 180:
                 return -1
         return 1
     except:
         return -1
 
-def dns_record(url):
+async def _dns_cached(domain):
+    if domain in _dns_cache:
+        return _dns_cache[domain]
     try:
-        dns.resolver.resolve(get_domain(url), 'A')
-        return 1
-    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.Timeout):
+        await resolver.resolve(domain, 'A')
+        result = 1
+    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+        result = -1
+    _dns_cache[domain] = result
+    return result
+
+async def dns_record(p):
+    try:
+        return await _dns_cached(p.domain)
+    except dns.exception.Timeout:
         return -1
 
 # --- NEWLY IMPLEMENTED FUNCTIONS ---
 
-def favicon(url):
-    soup = get_soup(url)
-    if not soup: return -1
-    # Check if favicon is loaded from the same domain
-    icon_link = soup.find("link", rel=re.compile(r'icon', re.I))
-    if icon_link and icon_link.has_attr('href'):
-        href_domain = get_domain(urllib.parse.urljoin(url, icon_link['href']))
-        if href_domain != get_domain(url):
-            return -1 # Favicon from a different domain is suspicious
-    return 1
-
-def request_url(url):
-    soup = get_soup(url)
-    if not soup: return -1
-    
-    domain = get_domain(url)
+def _page_features(p, soup):
+    """Computes (favicon, request_url, url_of_anchor) in a single walk over the page."""
+    if not soup: return -1, -1, -1
+
+    url, domain = p.raw, p.domain
+    icon_link = None
     image_count = 0
     external_image_count = 0
-    
-    for img in soup.find_all('img'):
-        if img.has_attr('src'):
-            image_count += 1
-            src_domain = get_domain(urllib.parse.urljoin(url, img['src']))
-            if src_domain != domain:
-                external_image_count += 1
-    
-    if image_count == 0: return 1 # No images, no external content
-    
-    percentage = (external_image_count / image_count) * 100
-    if percentage < 22.0: return 1
-    if 22.0 <= percentage < 61.0: return 0
-    return -1
-
-def url_of_anchor(url):
-    soup = get_soup(url)
-    if not soup: return -1
-
-    domain = get_domain(url)
     anchor_count = 0
     external_anchor_count = 0
 
-    for a in soup.find_all('a'):
-        if a.has_attr('href'):
-            anchor_count += 1
-            href = a['href']
+    for tag in soup.find_all(['link', 'img', 'a']):
+        if tag.name == 'link':
+            if icon_link is None and any('icon' in rel.lower() for rel in tag.get('rel', [])):
+                icon_link = tag
+        elif tag.name == 'img':
+            if tag.has_attr('src'):
+                image_count += 1
+                src_domain = get_domain(urllib.parse.urljoin(url, tag['src']))
+                if src_domain != domain:
+                    external_image_count += 1
+        elif tag.has_attr('href'):
+            href = tag['href']
             # Ignore empty, mailto, or javascript links
             if href.startswith('#') or href.startswith('mailto:') or 'javascript:void(0)' in href:
-                anchor_count -= 1 # Don't count these
                 continue
-            
+            anchor_count += 1
             href_domain = get_domain(urllib.parse.urljoin(url, href))
             if href_domain != domain:
                 external_anchor_count += 1
 
-    if anchor_count == 0: return 1
-
-    percentage = (external_anchor_count / anchor_count) * 100
-    if percentage < 31.0: return 1
-    if 31.0 <= percentage < 67.0: return 0
-    return -1
-
-def abnormal_url(url):
+    # Favicon: loading it from a different domain is suspicious
+    fav = 1
+    if icon_link and icon_link.has_attr('href'):
+        if get_domain(urllib.parse.urljoin(url, icon_link['href'])) != domain:
+            fav = -1
+
+    # Request URL: share of images loaded from other domains
+    req = 1 # No images, no external content
+    if image_count:
+        percentage = (external_image_count / image_count) * 100
+        if percentage < 22.0: req = 1
+        elif percentage < 61.0: req = 0
+        else: req = -1
+
+    # URL of anchor: share of links pointing to other domains
+    anchor = 1
+    if anchor_count:
+        percentage = (external_anchor_count / anchor_count) * 100
+        if percentage < 31.0: anchor = 1
+        elif percentage < 67.0: anchor = 0
+        else: anchor = -1
+
+    return fav, req, anchor
+
+def abnormal_url(p, w):
     try:
-        domain = get_domain(url)
-        w = whois.whois(domain)
         # If the domain name is not in the WHOIS response text, it's suspicious
-        if domain.lower() not in str(w).lower():
+        if p.domain.lower() not in str(w).lower():
             return -1
         return 1
     except:
         return -1
 
+# --- Lookup-backed feature groups ---
+
+async def whois_features(p):
+    """Returns (domain_registration_length, abnormal_url, age_of_domain) from one WHOIS lookup."""
+    w = await _whois_once(p.domain)
+    if w is None:
+        # Raised so callers treat the lookup as failed and skip caching
+        raise LookupError(f"WHOIS lookup failed for {p.domain}")
+    return domain_registration_length(w), abnormal_url(p, w), age_of_domain(w)
+
+async def domain_features(p):
+    """
+    Returns the features that depend only on the URL's domain:
+    (having_ip_address, shortening_service, prefix_suffix, having_sub_domain,
+    domain_registration_length, abnormal_url, age_of_domain, dns_record).
+    """
+    if p.domain in _domain_feature_cache:
+        return _domain_feature_cache[p.domain]
+
+    results = await asyncio.gather(
+        dns_record(p),
+        asyncio.wait_for(whois_features(p), LOOKUP_TIMEOUT),
+        return_exceptions=True
+    )
+    # A failed lookup marks every feature depending on it as suspicious and
+    # keeps the result out of the cache so the next request retries it
+    failed = any(isinstance(result, Exception) for result in results)
+    defaults = (-1, (-1, -1, -1))
+    dns_ok, whois_feats = [
+        default if isinstance(result, Exception) else result
+        for result, default in zip(results, defaults)
+    ]
+
+    features = (
+        having_ip_address(p), shortening_service(p), prefix_suffix(p),
+        having_sub_domain(p), *whois_feats, dns_ok
+    )
+    if not failed:
+        _domain_feature_cache[p.domain] = features
+    return features
+
+async def page_features(p):
+    """Returns (favicon, request_url, url_of_anchor) from one page fetch."""
+    if p.raw in _page_feature_cache:
+        return _page_feature_cache[p.raw]
+    soup = await get_soup(p.raw)
+    features = _page_features(p, soup)
+    # Failed fetches are retried on the next request
+    if soup is not None:
+        _page_feature_cache[p.raw] = features
+    return features
+
 # --- Functions That Are Hard to Implement ---
-def web_traffic(url): return 0
-def page_rank(url): return 0
-def google_index(url): return 1
-def links_pointing_to_page(url): return 0
+def web_traffic(p): return 0
+def page_rank(p): return 0
+def google_index(p): return 1
+def links_pointing_to_page(p): return 0
 
 # --- Functions that were already placeholders in the dataset logic ---
-def port(url): return 1
-def https_token(url): return 1
-def links_in_tags(url): return 1
-def sfh(url): return 1
-def submitting_to_email(url): return 1
-def redirect(url): return 1
-def on_mouseover(url): return 1
-def right_click(url): return 1
-def popup_window(url): return 1
-def iframe(url): return 1
-def statistical_report(url): return 1
+def port(p): return 1
+def https_token(p): return 1
+def links_in_tags(p): return 1
+def sfh(p): return 1
+def submitting_to_email(p): return 1
+def redirect(p): return 1
+def on_mouseover(p): return 1
+def right_click(p): return 1
+def popup_window(p): return 1
+def iframe(p): return 1
+def statistical_report(p): return 1
 
 # =================================================================
 # === PREDICTION LOGIC (Now more accurate)                      ===
 # =================================================================
-def predict_url(model, url):
-    """Predicts the class of a URL and returns the label and confidence score."""
-    if dns_record(url) == -1:
-        return "Unsafe (Phishing)", 1.0
+LABEL_MAP = {1: "Safe", 0: "Neutral", -1: "Unsafe (Phishing)"}
+
+# Purely local checks that point to phishing on their own
+_STRONG_SIGNALS = (having_ip_address, having_at_symbol, shortening_service)
+# Common on legitimate sites too, so these only add weight to a strong signal
+_WEAK_SIGNALS = (url_length, having_sub_domain)
+
+def _is_cheaply_flagged(p):
+    """
+    Returns True when the URL can be flagged without any network I/O: a strong
+    local signal fires together with at least one other local signal.
+    """
+    strong = 0
+    for bit, feature in enumerate(_STRONG_SIGNALS):
+        strong |= (feature(p) == -1) << bit
+    if not strong:
+        return False
+
+    weak = 0
+    for bit, feature in enumerate(_WEAK_SIGNALS):
+        weak |= (feature(p) == -1) << bit
+    # An IP literal's dots are not subdomains
+    if having_ip_address(p) == -1:
+        weak &= ~(1 << _WEAK_SIGNALS.index(having_sub_domain))
+    return strong.bit_count() + weak.bit_count() >= 2
+
+async def extract_features(url):
+    """
+    Returns the 30 model features for a URL, or None if it is already known to be
+    phishing (several cheap signals trigger, or its domain does not resolve).
+    """
+    p = parse_url(url)
+    if _is_cheaply_flagged(p):
+        return None
+
+    # Each coroutine derives a group of features from shared lookups, so
+    # total latency is that of the slowest lookup.
+    results = await asyncio.gather(
+        domain_features(p), asyncio.wait_for(page_features(p), LOOKUP_TIMEOUT),
+        return_exceptions=True
+    )
+    # A failed group marks all of its features as suspicious
+    defaults = ((-1,) * 8, (-1, -1, -1))
+    domain_feats, page_feats = [
+        default if isinstance(result, Exception) else result
+        for result, default in zip(results, defaults)
+    ]
+    (ip_address, shortener, prefix, sub_domain,
+     reg_length, abnormal, age, dns_ok) = domain_feats
+    if dns_ok == -1:
+        return None
+
+    fav, req, anchor = page_feats
 
     features = [
-        having_ip_address(url), url_length(url), shortening_service(url),
-        having_at_symbol(url), double_slash_redirecting(url), prefix_suffix(url),
-        having_sub_domain(url), ssl_final_state(url), domain_registration_length(url),
-        favicon(url), port(url), https_token(url), request_url(url), url_of_anchor(url),
-        links_in_tags(url), sfh(url), submitting_to_email(url), abnormal_url(url),
-        redirect(url), on_mouseover(url), right_click(url), popup_window(url),
-        iframe(url), age_of_domain(url), dns_record(url), web_traffic(url),
-        page_rank(url), google_index(url), links_pointing_to_page(url),
-        statistical_report(url)
+        ip_address, url_length(p), shortener,
+        having_at_symbol(p), double_slash_redirecting(p), prefix,
+        sub_domain, ssl_final_state(p), reg_length,
+        fav, port(p), https_token(p), req, anchor,
+        links_in_tags(p), sfh(p), submitting_to_email(p),
+        abnormal, redirect(p), on_mouseover(p), right_click(p),
+        popup_window(p), iframe(p), age, dns_ok, web_traffic(p),
+        page_rank(p), google_index(p), links_pointing_to_page(p),
+        statistical_report(p)
     ]
+    return features
+
+async def predict_url(model, url):
+    """Predicts the class of a URL and returns the label and confidence score."""
+    features = await extract_features(url)
+    if features is None:
+        return "Unsafe (Phishing)", 1.0
     
     try:
-        prediction = model.predict([features])[0]
-        probabilities = model.predict_proba([features])[0]
-        confidence = max(probabilities)
+        _FEAT_BUF[0] = features
+        predictions, probabilities = run_model(model, _FEAT_BUF)
+        prediction = predictions[0]
+        confidence = max(probabilities[0])
         
-        label_map = {1: "Safe", 0: "Neutral", -1: "Unsafe (Phishing)"}
-        label = label_map.get(prediction, "Unknown")
+        label = LABEL_MAP.get(prediction, "Unknown")
         
         return label, confidence
     except Exception as e:
         return f"Error during prediction: {e}", 0.0
 
+# Largest accepted batch, and how many of its URLs are looked up at a time.
+# The latter stays well below the HTTP client's connection pool so page
+# fetches do not queue past LOOKUP_TIMEOUT.
+MAX_BATCH_SIZE = 100
+BATCH_CONCURRENCY = 20
+_batch_slots = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+async def _extract_features_bounded(url):
+    async with _batch_slots:
+        return await extract_features(url)
+
+async def predict_urls(model, urls):
+    """Predicts many URLs with a single model call and returns a (label, confidence) per URL."""
+    all_features = await asyncio.gather(*[_extract_features_bounded(url) for url in urls])
+
+    results = [("Unsafe (Phishing)", 1.0)] * len(urls)
+    rows = [i for i, features in enumerate(all_features) if features is not None]
+    if not rows:
+        return results
+
+    try:
+        matrix = np.array([all_features[i] for i in rows], dtype=np.int8)
+        predictions, probabilities = run_model(model, matrix)
+        for i, prediction, proba in zip(rows, predictions, probabilities):
+            results[i] = LABEL_MAP.get(prediction, "Unknown"), max(proba)
+    except Exception as e:
+        for i in rows:
+            results[i] = f"Error during prediction: {e}", 0.0
+    return results
+
 # --- FastAPI App ---
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+
+class URLBatch(BaseModel):
+    urls: list[str] = Field(max_length=MAX_BATCH_SIZE)
 
 # Load the trained model
 try:
     model_path = os.path.join(os.path.dirname(__file__), 'phishing_gradient_boosting_model.joblib')
+    # Loaded once at import; gunicorn's --preload (see Dockerfile) forks the
+    # workers afterwards so they share this copy copy-on-write.
     model = joblib.load(model_path)
 except FileNotFoundError:
     print(f"Model file not found at {model_path}")
     sys.exit(1)
 
+# Use the ONNX export of the model when available (see convert_model.py); its
+# native tree evaluation is much faster than sklearn for single-row queries.
+onnx_session = None
+onnx_path = os.path.join(os.path.dirname(__file__), 'phishing_gradient_boosting_model.onnx')
+if onnxruntime is not None and os.path.exists(onnx_path):
+    onnx_session = onnxruntime.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+
+def run_model(model, matrix):
+    """Returns (predictions, probabilities) for a feature matrix."""
+    if onnx_session is not None:
+        predictions, probabilities = onnx_session.run(None, {'x': matrix.astype(np.float32)})
+        return predictions, probabilities
+    return model.predict(matrix), model.predict_proba(matrix)
+
+
+@app.on_event("startup")
+async def open_http_client():
+    # Shared pool so page fetches reuse connections instead of paying a new
+    # TCP and TLS handshake each time.
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
+    )
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await app.state.http.aclose()
+
 
 @app.get('/')
 def read_root():
     return {'message': 'Phishing URL Detection API'}
 
+def normalize_url(url):
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return url
+
 @app.get('/predict')
-def predict_url_endpoint(url: str):
+async def predict_url_endpoint(url: str):
     """
     Predicts if a URL is a phishing URL and returns the label and confidence score.
     """
-    test_url = url
+    test_url = normalize_url(url)
     
-    if not test_url.startswith(('http://', 'https://')):
-        test_url = 'https://' + test_url
-    
-    label, confidence = predict_url(model, test_url)
+    label, confidence = await predict_url(model, test_url)
     return {"prediction": label, "confidence": float(confidence), "url": test_url}
+
+@app.post('/predict_batch')
+async def predict_batch_endpoint(data: URLBatch):
+    """
+    Predicts several URLs at once, returning one result per URL in request order.
+    """
+    test_urls = [normalize_url(url) for url in data.urls]
+
+    results = await predict_urls(model, test_urls)
+    return [
+        {"prediction": label, "confidence": float(confidence), "url": test_url}
+        for test_url, (label, confidence) in zip(test_urls, results)
+    ]
@@ -1,26 +1,39 @@
+import asyncio
 import json
-import requests
+import aiohttp
 import sys
 
-def test_url(url_to_test):
+API_URL = 'https://phishing-detection-api-new-test-production.up.railway.app/predict_batch'
+BATCH_SIZE = 20
+
+async def test_urls(session, urls_to_test):
     """
-    Sends a URL to the prediction API and prints the result.
+    Sends a batch of URLs to the prediction API and prints the results.
     """
-    api_url = 'https://phishing-detection-api-new-test-production.up.railway.app/predict'
-    params = {'url': url_to_test}
+    payload = {'urls': urls_to_test}
     
     try:
-        response = requests.get(api_url, params=params)
-        response.raise_for_status()  # Raise an exception for bad status codes
+        async with session.post(API_URL, json=payload) as response:
+            response.raise_for_status()  # Raise an exception for bad status codes
+            results = await response.json()
         
-        print(f"Testing URL: {url_to_test}")
-        print("Response:")
-        print(json.dumps(response.json(), indent=2))
-        print("-" * 30)
+        for result in results:
+            print(f"Testing URL: {result['url']}")
+            print("Response:")
+            print(json.dumps(result, indent=2))
+            print("-" * 30)
 
-    except requests.exceptions.RequestException as e:
+    except aiohttp.ClientError as e:
         print(f"Error connecting to the API: {e}")
-        print("Please ensure the Docker container is running and accessible at", api_url)
+        print("Please ensure the Docker container is running and accessible at", API_URL)
+
+async def main(urls_to_test):
+    # All batches are sent concurrently over one pooled session
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*[
+            test_urls(session, urls_to_test[i:i + BATCH_SIZE])
+            for i in range(0, len(urls_to_test), BATCH_SIZE)
+        ])
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -28,5 +41,4 @@ if __name__ == "__main__":
         sys.exit(1)
 
     urls_to_test = sys.argv[1:]
-    for url in urls_to_test:
-        test_url(url)
+    asyncio.run(main(urls_to_test))
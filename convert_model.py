@@ -0,0 +1,27 @@
+import os
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+import joblib
+
+def convert(model_path, onnx_path):
+    """
+    Exports the trained scikit-learn model to ONNX for use by the API server.
+    Requires skl2onnx, which is only needed for this one-time conversion.
+    """
+    model = joblib.load(model_path)
+    onnx_model = convert_sklearn(
+        model,
+        initial_types=[('x', FloatTensorType([None, 30]))],
+        # Return probabilities as a plain array rather than a list of dicts
+        options={id(model): {'zipmap': False}},
+    )
+    with open(onnx_path, 'wb') as f:
+        f.write(onnx_model.SerializeToString())
+    print(f"Saved ONNX model to {onnx_path}")
+
+if __name__ == "__main__":
+    app_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app')
+    convert(
+        os.path.join(app_dir, 'phishing_gradient_boosting_model.joblib'),
+        os.path.join(app_dir, 'phishing_gradient_boosting_model.onnx'),
+    )